@@ -1,37 +1,47 @@
 #!/usr/bin/env python3
 """Streamlit UI for SQL Agent with Synthetic Data Generation."""
 
+import json
+from collections import deque
+from functools import cached_property
+from itertools import islice
+import re
 import streamlit as st
 import sys
+import uuid
 from pathlib import Path
-import pandas as pd
+import pyarrow as pa
 from io import StringIO
 
-# Add src directory to Python path
+# Add src directory to Python path (once per process; Streamlit reruns this script)
 src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
 
 from synthetic_data_generator import SyntheticDataGenerator
 
-# Try to import agent, but make it optional
-try:
-    # Import the modules individually to avoid relative import issues
-    from config import settings
-    from sql_tools import SQLTools
-    from gradientai import Gradient
-    
-    # Create a simple agent class that works with the imports
-    class SQLAgent:
-        def __init__(self):
-            self.gradient = Gradient(
-                access_token=settings.gradient_access_token,
-                workspace_id=settings.gradient_workspace_id
-            )
-            self.sql_tools = SQLTools()
-            self.system_prompt = self._build_system_prompt()
-        
-        def _build_system_prompt(self):
-            return """You are a SQL Agent with synthetic data generation capabilities. Your role is to help developers and testers create safe mock datasets and SQL queries without touching production data.
+# Record count in chat requests (e.g. "Generate 10 users")
+_COUNT_RE = re.compile(r"\d+")
+# Data type keywords, dispatched on the first one found
+# (matched against lowercased input)
+_KIND_RE = re.compile(
+    r"(?P<users>user)|(?P<orders>order)|(?P<payments>payment|transaction)|(?P<products>product)"
+)
+_FAILED_RE = re.compile(r"failed")
+_TABLE_FOR = {
+    'users': 'users',
+    'orders': 'orders',
+    'payments': 'payment_transactions',
+    'products': 'products',
+}
+
+# Rows rendered on screen for CSV/JSON output; downloads always get every row
+_PREVIEW_ROWS = 100
+
+# Chat history kept in session state; older messages are dropped
+_MAX_CHAT_MESSAGES = 50
+
+_SYSTEM_PROMPT = """You are a SQL Agent with synthetic data generation capabilities. Your role is to help developers and testers create safe mock datasets and SQL queries without touching production data.
 
 CORE CAPABILITIES:
 1. Generate synthetic data (users, orders, payments, products, custom schemas)
@@ -72,6 +82,44 @@ Example interactions:
 - "Export 50 products as CSV" → CSV format data
 
 Always prioritize safety and provide helpful, accurate responses."""
+
+# Try to import agent, but make it optional. The import and class definition
+# are cached so they run once per process rather than on every rerun.
+@st.cache_resource(show_spinner=False)
+def _load_agent_cls():
+    try:
+        # Import the modules individually to avoid relative import issues
+        from config import settings
+        from sql_tools import SQLTools
+        from gradientai import Gradient
+    except (ImportError, ValueError):
+        # Optional dependencies not installed, or settings failed validation
+        # (e.g. missing Gradient credentials)
+        return None
+    
+    # Create a simple agent class that works with the imports
+    class SQLAgent:
+        system_prompt = _SYSTEM_PROMPT
+        
+        def __init__(self):
+            self.sql_tools = SQLTools()
+            
+            # Bind generator methods once so chat dispatch is a dict lookup
+            generator = self.sql_tools.generator
+            self._dispatch = {
+                'users': generator.generate_users,
+                'orders': generator.generate_orders,
+                'payments': generator.generate_payment_transactions,
+                'products': generator.generate_products,
+            }
+        
+        @cached_property
+        def gradient(self):
+            # Created on first use; chat() currently answers locally
+            return Gradient(
+                access_token=settings.gradient_access_token,
+                workspace_id=settings.gradient_workspace_id
+            )
         
         def chat(self, user_input):
             # Simple chat implementation that generates data based on keywords
@@ -79,54 +127,46 @@ Always prioritize safety and provide helpful, accurate responses."""
             
             # For now, use data generation for all requests to ensure reliability
             # This avoids Gradient AI API issues while still providing useful functionality
-            return self._generate_data_from_request(user_input)
+            return self._generate_data_from_request(user_input, user_input_lower)
         
-        def _generate_data_from_request(self, user_input):
-            # Simple data generation based on keywords
-            user_input_lower = user_input.lower()
+        def _generate_data_from_request(self, user_input, user_input_lower=None):
+            user_input_lower = user_input_lower or user_input.lower()
             
             # Extract count
-            import re
-            count_match = re.search(r'(\d+)', user_input)
-            count = int(count_match.group(1)) if count_match else 10
+            count_match = _COUNT_RE.search(user_input_lower)
+            count = int(count_match.group()) if count_match else 10
             
-            # Determine data type and special handling
-            if 'user' in user_input_lower:
-                data = self.sql_tools.generator.generate_users(count)
-                table_name = 'users'
-            elif 'order' in user_input_lower:
-                data = self.sql_tools.generator.generate_orders(count)
-                table_name = 'orders'
-            elif 'payment' in user_input_lower or 'transaction' in user_input_lower:
-                # Check if user wants failed transactions specifically
-                if 'failed' in user_input_lower:
-                    data = self.sql_tools.generator.generate_payment_transactions(count, include_failed=True)
-                else:
-                    data = self.sql_tools.generator.generate_payment_transactions(count)
-                table_name = 'payment_transactions'
-            elif 'product' in user_input_lower:
-                data = self.sql_tools.generator.generate_products(count)
-                table_name = 'products'
+            # Determine data type from the first keyword mentioned
+            kind_match = _KIND_RE.search(user_input_lower)
+            kind = kind_match.lastgroup if kind_match else 'users'
+            generate = self._dispatch[kind]
+            table_name = _TABLE_FOR[kind]
+            
+            # Check if user wants failed transactions specifically
+            if kind == 'payments' and _FAILED_RE.search(user_input_lower):
+                data = generate(count, status='failed')
             else:
-                data = self.sql_tools.generator.generate_users(count)
-                table_name = 'users'
+                data = generate(count)
             
-            # Generate SQL inserts
-            sql_inserts = self.sql_tools.generator.to_sql_inserts(data, table_name)
+            # Generate SQL inserts, formatting only the rows shown in the preview
+            preview = list(islice(self.sql_tools.generator.iter_sql_inserts(data, table_name), 5))
+            remaining = len(data) - len(preview)
             
-            # Provide a more helpful response
-            response = f"✅ Generated {len(data)} {table_name} records:\n\n"
-            response += "📋 SQL INSERT Statements:\n"
-            response += '\n'.join(sql_inserts[:5])
-            if len(sql_inserts) > 5:
-                response += f"\n... and {len(sql_inserts)-5} more statements"
+            # Provide a more helpful response, assembled with a single join
+            parts = [
+                f"✅ Generated {len(data)} {table_name} records:\n",
+                "📋 SQL INSERT Statements:",
+                *preview,
+            ]
+            if remaining > 0:
+                parts.append(f"... and {remaining} more statements")
             
-            return response
-    
-    AGENT_AVAILABLE = True
-except Exception as e:
-    SQLAgent = None
-    AGENT_AVAILABLE = False
+            return '\n'.join(parts)
+        
+    return SQLAgent
+
+SQLAgent = _load_agent_cls()
+AGENT_AVAILABLE = SQLAgent is not None
 
 # Page configuration
 st.set_page_config(
@@ -160,6 +200,50 @@ def refresh_agent():
         return get_agent()
     return None
 
+def store_generated_data(data, table_name, output_format):
+    """Persist generated data and give it a fresh key for the render caches"""
+    st.session_state.generated_data = data
+    st.session_state.table_name = table_name
+    st.session_state.output_format = output_format
+    st.session_state.data_key = uuid.uuid4().hex
+
+# Output renderers, cached per generated dataset so that unrelated widget
+# interactions don't re-serialize it. ``_data`` is skipped by Streamlit's
+# hasher; ``data_key`` identifies the dataset instead.
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_sql(data_key, _data, table_name):
+    return '\n'.join(get_generator().to_sql_inserts(_data, table_name))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_csv(data_key, _data):
+    generator = get_generator()
+    return generator.to_csv(_data), generator.to_csv(_data[:_PREVIEW_ROWS])
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_json(data_key, _data):
+    return (
+        json.dumps(_data, default=str, separators=(',', ':')),
+        json.dumps(_data[:_PREVIEW_ROWS], indent=2, default=str),
+    )
+
+# Quick actions always use the same parameters, so their data is cached and
+# shared across clicks and sessions until the TTL expires
+@st.cache_data(ttl=3600, show_spinner=False)
+def quick_users():
+    return get_generator().generate_users(10)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def quick_orders():
+    return get_generator().generate_orders(20, amount_range=(10, 500), year=2024)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def quick_failed_payments():
+    return get_generator().generate_payment_transactions(5, status='failed')
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def quick_products():
+    return get_generator().generate_products(15)
+
 generator = get_generator()
 agent = get_agent()
 
@@ -204,6 +288,44 @@ elif data_type == "Payments":
     st.sidebar.subheader("Payment Parameters")
     include_failed = st.sidebar.checkbox("Include Failed Transactions", value=True)
 
+# Chat history, input and responses run as a fragment, so sending a message
+# reruns only this panel instead of the whole app. Full-script reruns (sidebar
+# changes, Generate or Quick Action buttons) still run it and re-render history.
+@st.fragment
+def chat_panel(agent):
+    # Chat interface
+    if "messages" not in st.session_state:
+        st.session_state.messages = deque(maxlen=_MAX_CHAT_MESSAGES)
+    
+    # Display chat history
+    for role, content in st.session_state.messages:
+        with st.chat_message(role):
+            st.markdown(content)
+    
+    # Chat input
+    if prompt := st.chat_input("Ask me to generate data... (e.g., 'Generate 10 mock users with random names and emails')"):
+        # Add user message to chat history
+        st.session_state.messages.append(("user", prompt))
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        
+        # Get agent response
+        with st.chat_message("assistant"):
+            with st.spinner("Thinking..."):
+                try:
+                    response = agent.chat(prompt)
+                    st.markdown(response)
+                    st.session_state.messages.append(("assistant", response))
+                except Exception as e:
+                    error_msg = f"Error: {str(e)}"
+                    st.error(error_msg)
+                    st.session_state.messages.append(("assistant", error_msg))
+    
+    # Clear chat button
+    if st.button("🗑️ Clear Chat History"):
+        st.session_state.messages = deque(maxlen=_MAX_CHAT_MESSAGES)
+        st.rerun()
+
 # Create tabs for different interfaces
 tab1, tab2 = st.tabs(["🤖 Chat Interface", "⚙️ Manual Configuration"])
 
@@ -221,38 +343,7 @@ with tab1:
     else:
         st.success("✅ Gradient AI agent ready! Type your requests below.")
         
-        # Chat interface
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
-        
-        # Display chat history
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-        
-        # Chat input
-        if prompt := st.chat_input("Ask me to generate data... (e.g., 'Generate 10 mock users with random names and emails')"):
-            # Add user message to chat history
-            st.session_state.messages.append({"role": "user", "content": prompt})
-            with st.chat_message("user"):
-                st.markdown(prompt)
-            
-            # Get agent response
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    try:
-                        response = agent.chat(prompt)
-                        st.markdown(response)
-                        st.session_state.messages.append({"role": "assistant", "content": response})
-                    except Exception as e:
-                        error_msg = f"Error: {str(e)}"
-                        st.error(error_msg)
-                        st.session_state.messages.append({"role": "assistant", "content": error_msg})
-        
-        # Clear chat button
-        if st.button("🗑️ Clear Chat History"):
-            st.session_state.messages = []
-            st.rerun()
+        chat_panel(agent)
 
 with tab2:
     st.header("⚙️ Manual Configuration")
@@ -297,9 +388,7 @@ with tab2:
                     
                     if data:
                         # Store data in session state
-                        st.session_state.generated_data = data
-                        st.session_state.table_name = table_name
-                        st.session_state.output_format = output_format
+                        store_generated_data(data, table_name, output_format)
                         
                         st.success(f"✅ Generated {len(data)} {data_type.lower()} successfully!")
                         
@@ -311,19 +400,20 @@ with tab2:
             data = st.session_state.generated_data
             table_name = st.session_state.table_name
             output_format = st.session_state.output_format
+            data_key = st.session_state.data_key
             
             st.subheader(f"📋 {len(data)} {data_type} Records")
             
-            # Convert to DataFrame for display
-            df = pd.DataFrame(data)
+            # Build an Arrow table for display; st.dataframe sends Arrow to the
+            # browser, so this skips the pandas round-trip
+            table = pa.Table.from_pylist(data)
             
             # Display as table
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(table, use_container_width=True)
         
             # Generate output based on format
             if output_format == "SQL INSERT":
-                sql_inserts = generator.to_sql_inserts(data, table_name)
-                sql_output = '\n'.join(sql_inserts)
+                sql_output = render_sql(data_key, data, table_name)
             
                 st.subheader("💾 SQL INSERT Statements")
                 st.code(sql_output, language="sql")
@@ -337,10 +427,12 @@ with tab2:
                 )
                 
             elif output_format == "CSV":
-                csv_output = generator.to_csv(data)
+                csv_output, csv_preview = render_csv(data_key, data)
                 
                 st.subheader("📊 CSV Data")
-                st.code(csv_output)
+                if len(data) > _PREVIEW_ROWS:
+                    st.caption(f"Showing the first {_PREVIEW_ROWS} of {len(data)} rows")
+                st.code(csv_preview)
                 
                 # Download button
                 st.download_button(
@@ -351,11 +443,12 @@ with tab2:
                 )
                 
             elif output_format == "JSON":
-                import json
-                json_output = json.dumps(data, indent=2, default=str)
+                json_output, json_preview = render_json(data_key, data)
                 
                 st.subheader("📄 JSON Data")
-                st.code(json_output, language="json")
+                if len(data) > _PREVIEW_ROWS:
+                    st.caption(f"Showing the first {_PREVIEW_ROWS} of {len(data)} records")
+                st.code(json_preview, language="json")
                 
                 # Download button
                 st.download_button(
@@ -372,31 +465,23 @@ with tab2:
         st.subheader("One-Click Generation")
         
         if st.button("👥 10 Users", use_container_width=True):
-            data = generator.generate_users(10)
-            st.session_state.generated_data = data
-            st.session_state.table_name = "users"
-            st.session_state.output_format = "SQL INSERT"
+            data = quick_users()
+            store_generated_data(data, "users", "SQL INSERT")
             st.rerun()
         
         if st.button("🛒 20 Orders ($10-$500)", use_container_width=True):
-            data = generator.generate_orders(20, amount_range=(10, 500), year=2024)
-            st.session_state.generated_data = data
-            st.session_state.table_name = "orders"
-            st.session_state.output_format = "SQL INSERT"
+            data = quick_orders()
+            store_generated_data(data, "orders", "SQL INSERT")
             st.rerun()
         
         if st.button("💳 5 Failed Payments", use_container_width=True):
-            data = generator.generate_payment_transactions(5, include_failed=True)
-            st.session_state.generated_data = data
-            st.session_state.table_name = "payment_transactions"
-            st.session_state.output_format = "SQL INSERT"
+            data = quick_failed_payments()
+            store_generated_data(data, "payment_transactions", "SQL INSERT")
             st.rerun()
         
         if st.button("📦 15 Products (CSV)", use_container_width=True):
-            data = generator.generate_products(15)
-            st.session_state.generated_data = data
-            st.session_state.table_name = "products"
-            st.session_state.output_format = "CSV"
+            data = quick_products()
+            store_generated_data(data, "products", "CSV")
             st.rerun()
         
         # Clear data button
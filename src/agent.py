@@ -1,27 +1,58 @@
 """Main SQL Agent with synthetic data generation capabilities."""
 
+import atexit
+import os
 import re
-from typing import Dict, Any, List, Optional, Tuple
+import sys
+from functools import cached_property
+from typing import ClassVar, Dict, Any, List, Optional, Tuple
 from gradientai import Gradient
 from .config import settings
 from .sql_tools import SQLTools
 
+try:
+    import readline
+except ImportError:  # Not available on Windows
+    readline = None
+
+# Generation request parsing patterns
+_COUNT_RE = re.compile(r'(\d+)\s*(?:mock|fake|test)?\s*(?:users?|orders?|payments?|products?|records?)')
+_AMOUNT_RE = re.compile(r'\$?(\d+)\s*[-–]\s*\$?(\d+)')
+_YEAR_RE = re.compile(r'(\d{4})')
+
+# Input history for the interactive prompt
+_HISTORY_FILE = os.path.expanduser('~/.sql_agent_history')
+
+# Keyword -> value tables for generation requests; the keyword that appears
+# earliest in the lowercased input wins
+_DATA_TYPE_KEYWORDS = (
+    ('order', 'orders'),
+    ('payment', 'payments'),
+    ('transaction', 'payments'),
+    ('product', 'products'),
+    ('user', 'users'),
+)
+_FORMAT_KEYWORDS = (
+    ('csv', 'csv'),
+    ('json', 'json'),
+)
+
+# Chat intent keywords (matched against lowercased input)
+_GEN_RE = re.compile(r'generate|create|mock|fake|test data|synthetic')
+_SQL_VERBS = ('select', 'show', 'describe', 'explain', 'with')
+_INFO_RE = re.compile(r'tables|schema|database info|show tables')
+
+
+def _first_keyword(text: str, keywords: Tuple[Tuple[str, str], ...], default: str) -> str:
+    """Return the value for whichever keyword occurs first in text."""
+    found = [(pos, value) for keyword, value in keywords if (pos := text.find(keyword)) != -1]
+    return min(found, key=lambda item: item[0])[1] if found else default
+
 
 class SQLAgent:
     """SQL Agent with synthetic data generation capabilities."""
     
-    def __init__(self):
-        """Initialize the SQL Agent."""
-        self.gradient = Gradient(
-            access_token=settings.gradient_access_token,
-            workspace_id=settings.gradient_workspace_id
-        )
-        self.sql_tools = SQLTools()
-        self.system_prompt = self._build_system_prompt()
-    
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt for the agent."""
-        return """You are a SQL Agent with synthetic data generation capabilities. Your role is to help developers and testers create safe mock datasets and SQL queries without touching production data.
+    _SYSTEM_PROMPT: ClassVar[str] = """You are a SQL Agent with synthetic data generation capabilities. Your role is to help developers and testers create safe mock datasets and SQL queries without touching production data.
 
 CORE CAPABILITIES:
 1. Generate synthetic data (users, orders, payments, products, custom schemas)
@@ -62,49 +93,78 @@ Example interactions:
 - "Export 50 products as CSV" → CSV format data
 
 Always prioritize safety and provide helpful, accurate responses."""
+    
+    _HELP_TEXT: ClassVar[str] = """
+SQL Agent Help
+==============
 
-    def _parse_generation_request(self, user_input: str) -> Dict[str, Any]:
+DATA GENERATION EXAMPLES:
+- "Generate 10 mock users" → SQL INSERT statements for users
+- "Create 20 orders with amounts $10-500" → Orders with specified amount range
+- "Give me 5 failed payment transactions" → Failed payment records
+- "Generate 15 products as CSV" → Product data in CSV format
+- "Create 50 users for 2024" → Users with 2024 creation dates
+
+SQL QUERIES:
+- "SELECT * FROM users LIMIT 5" → Execute safe SELECT queries
+- "SHOW TABLES" → List all tables in database
+- "DESCRIBE users" → Show table schema
+
+DATABASE INFO:
+- "Show database info" → Display connected database information
+- "List tables" → Show all available tables
+
+SAFETY FEATURES:
+- Only SELECT queries are executed
+- No production data exposure
+- Automatic query validation
+- Record count limits
+
+Type 'quit' to exit.
+"""
+    
+    def __init__(self):
+        """Initialize the SQL Agent."""
+        self.sql_tools = SQLTools()
+    
+    @cached_property
+    def gradient(self) -> Gradient:
+        """Gradient client, created on first use so local-only workflows skip it."""
+        return Gradient(
+            access_token=settings.gradient_access_token,
+            workspace_id=settings.gradient_workspace_id
+        )
+    
+    def _parse_generation_request(self, user_input: str,
+                                  user_input_lower: Optional[str] = None) -> Dict[str, Any]:
         """Parse user input to extract generation parameters.
         
         Args:
             user_input: User's request
+            user_input_lower: The request already lowercased, if the caller has it
             
         Returns:
             Dictionary with parsed parameters
         """
-        user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower or user_input.lower()
         
         # Extract count
-        count_match = re.search(r'(\d+)\s*(?:mock|fake|test)?\s*(?:users?|orders?|payments?|products?|records?)', user_input_lower)
+        count_match = _COUNT_RE.search(user_input_lower)
         count = int(count_match.group(1)) if count_match else 10
         
-        # Extract data type
-        data_type = 'users'
-        if 'order' in user_input_lower:
-            data_type = 'orders'
-        elif 'payment' in user_input_lower or 'transaction' in user_input_lower:
-            data_type = 'payments'
-        elif 'product' in user_input_lower:
-            data_type = 'products'
-        elif 'user' in user_input_lower:
-            data_type = 'users'
-        
-        # Extract format
-        format_type = 'sql'
-        if 'csv' in user_input_lower:
-            format_type = 'csv'
-        elif 'json' in user_input_lower:
-            format_type = 'json'
+        # Extract data type and format from the earliest matching keyword
+        data_type = _first_keyword(user_input_lower, _DATA_TYPE_KEYWORDS, 'users')
+        format_type = _first_keyword(user_input_lower, _FORMAT_KEYWORDS, 'sql')
         
         # Extract amount range for orders
         amount_range = (10, 500)
-        amount_match = re.search(r'\$?(\d+)\s*[-–]\s*\$?(\d+)', user_input)
+        amount_match = _AMOUNT_RE.search(user_input)
         if amount_match:
             amount_range = (float(amount_match.group(1)), float(amount_match.group(2)))
         
         # Extract year
         year = None
-        year_match = re.search(r'(\d{4})', user_input)
+        year_match = _YEAR_RE.search(user_input)
         if year_match:
             year = int(year_match.group(1))
         
@@ -120,17 +180,18 @@ Always prioritize safety and provide helpful, accurate responses."""
             'include_failed': include_failed
         }
     
-    def generate_synthetic_data(self, user_input: str) -> str:
+    def generate_synthetic_data(self, user_input: str, user_input_lower: Optional[str] = None) -> str:
         """Generate synthetic data based on user request.
         
         Args:
             user_input: User's request for data generation
+            user_input_lower: The request already lowercased, if the caller has it
             
         Returns:
             Generated data in requested format
         """
         try:
-            params = self._parse_generation_request(user_input)
+            params = self._parse_generation_request(user_input, user_input_lower)
             
             if params['data_type'] == 'users':
                 return self.sql_tools.generate_mock_users(
@@ -158,10 +219,9 @@ Always prioritize safety and provide helpful, accurate responses."""
                         params['count']
                     )
                     if params['format_type'] == 'sql':
-                        inserts = self.sql_tools.generator.to_sql_inserts(
+                        return self.sql_tools.generator.to_sql_string(
                             transactions, 'payment_transactions'
                         )
-                        return '\n'.join(inserts)
                     elif params['format_type'] == 'csv':
                         return self.sql_tools.generator.to_csv(transactions)
                     else:
@@ -170,8 +230,7 @@ Always prioritize safety and provide helpful, accurate responses."""
             elif params['data_type'] == 'products':
                 products = self.sql_tools.generator.generate_products(params['count'])
                 if params['format_type'] == 'sql':
-                    inserts = self.sql_tools.generator.to_sql_inserts(products, 'products')
-                    return '\n'.join(inserts)
+                    return self.sql_tools.generator.to_sql_string(products, 'products')
                 elif params['format_type'] == 'csv':
                     return self.sql_tools.generator.to_csv(products)
                 else:
@@ -200,12 +259,12 @@ Always prioritize safety and provide helpful, accurate responses."""
                 if len(results) == 0:
                     return "Query executed successfully. No rows returned."
                 else:
-                    formatted_results = f"Query executed successfully. {len(results)} rows returned:\n\n"
-                    for i, row in enumerate(results[:10]):  # Limit to first 10 rows
-                        formatted_results += f"Row {i+1}: {row}\n"
+                    parts = [f"{message}\n"]
+                    # Limit to first 10 rows
+                    parts.extend(f"Row {i+1}: {row}" for i, row in enumerate(results[:10]))
                     if len(results) > 10:
-                        formatted_results += f"\n... and {len(results) - 10} more rows"
-                    return formatted_results
+                        parts.append(f"\n... and {len(results) - 10} more rows")
+                    return '\n'.join(parts)
             else:
                 return message
         else:
@@ -220,21 +279,19 @@ Always prioritize safety and provide helpful, accurate responses."""
         if not self.sql_tools.engine:
             return "No database connection available. Set DATABASE_URL in your environment to connect to a database."
         
-        tables = self.sql_tools.list_tables()
-        if not tables:
+        schemas = self.sql_tools.get_all_schemas()
+        if not schemas:
             return "Connected to database but no tables found."
         
-        info = f"Connected to database. Found {len(tables)} tables:\n\n"
-        for table in tables:
-            schema = self.sql_tools.get_table_schema(table)
-            if schema:
-                info += f"Table: {table}\n"
-                for col in schema['columns']:
-                    nullable = "NULL" if col['nullable'] else "NOT NULL"
-                    info += f"  - {col['name']}: {col['type']} {nullable}\n"
-                info += "\n"
+        lines = [f"Connected to database. Found {len(schemas)} tables:\n"]
+        for table, schema in schemas.items():
+            lines.append(f"Table: {table}")
+            for col in schema['columns']:
+                nullable = "NULL" if col['nullable'] else "NOT NULL"
+                lines.append(f"  - {col['name']}: {col['type']} {nullable}")
+            lines.append("")
         
-        return info
+        return '\n'.join(lines)
     
     def chat(self, user_input: str) -> str:
         """Main chat interface for the agent.
@@ -248,23 +305,21 @@ Always prioritize safety and provide helpful, accurate responses."""
         user_input_lower = user_input.lower()
         
         # Check if this is a data generation request
-        generation_keywords = ['generate', 'create', 'mock', 'fake', 'test data', 'synthetic']
-        if any(keyword in user_input_lower for keyword in generation_keywords):
-            return self.generate_synthetic_data(user_input)
+        if _GEN_RE.search(user_input_lower):
+            return self.generate_synthetic_data(user_input, user_input_lower)
         
         # Check if this is a SQL query
-        sql_keywords = ['select', 'show', 'describe', 'explain']
-        if any(keyword in user_input_lower for keyword in sql_keywords):
+        if user_input_lower.lstrip().startswith(_SQL_VERBS):
             return self.execute_sql_query(user_input)
         
         # Check if this is a database info request
-        if any(keyword in user_input_lower for keyword in ['tables', 'schema', 'database info', 'show tables']):
+        if _INFO_RE.search(user_input_lower):
             return self.get_database_info()
         
         # Use Gradient AI for general SQL assistance
         try:
             messages = [
-                {"role": "system", "content": self.system_prompt},
+                {"role": "system", "content": self._SYSTEM_PROMPT},
                 {"role": "user", "content": user_input}
             ]
             
@@ -286,15 +341,23 @@ Always prioritize safety and provide helpful, accurate responses."""
         print("Type 'quit' to exit, 'help' for examples")
         print()
         
+        if readline is not None:
+            try:
+                readline.read_history_file(_HISTORY_FILE)
+            except OSError:
+                pass
+            atexit.register(readline.write_history_file, _HISTORY_FILE)
+        
         while True:
             try:
                 user_input = input("You: ").strip()
+                command = user_input.lower()
                 
-                if user_input.lower() in ['quit', 'exit', 'q']:
+                if command in ('quit', 'exit', 'q'):
                     print("Goodbye!")
                     break
                 
-                if user_input.lower() == 'help':
+                if command == 'help':
                     self._show_help()
                     continue
                 
@@ -302,7 +365,9 @@ Always prioritize safety and provide helpful, accurate responses."""
                     continue
                 
                 response = self.chat(user_input)
-                print(f"Agent: {response}\n")
+                # One write and flush per response, however many lines it has
+                sys.stdout.write(f"Agent: {response}\n\n")
+                sys.stdout.flush()
                 
             except KeyboardInterrupt:
                 print("\nGoodbye!")
@@ -312,32 +377,5 @@ Always prioritize safety and provide helpful, accurate responses."""
     
     def _show_help(self):
         """Show help information."""
-        help_text = """
-SQL Agent Help
-==============
-
-DATA GENERATION EXAMPLES:
-- "Generate 10 mock users" → SQL INSERT statements for users
-- "Create 20 orders with amounts $10-500" → Orders with specified amount range
-- "Give me 5 failed payment transactions" → Failed payment records
-- "Generate 15 products as CSV" → Product data in CSV format
-- "Create 50 users for 2024" → Users with 2024 creation dates
-
-SQL QUERIES:
-- "SELECT * FROM users LIMIT 5" → Execute safe SELECT queries
-- "SHOW TABLES" → List all tables in database
-- "DESCRIBE users" → Show table schema
-
-DATABASE INFO:
-- "Show database info" → Display connected database information
-- "List tables" → Show all available tables
-
-SAFETY FEATURES:
-- Only SELECT queries are executed
-- No production data exposure
-- Automatic query validation
-- Record count limits
-
-Type 'quit' to exit.
-"""
-        print(help_text)
+        sys.stdout.write(self._HELP_TEXT + '\n')
+        sys.stdout.flush()
@@ -1,29 +1,54 @@
 """Configuration management for the SQL Agent."""
 
 import os
+from dataclasses import dataclass
 from typing import Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field
+from dotenv import load_dotenv
 
 
-class Settings(BaseSettings):
-    """Application settings."""
-    
+def _require_env(name: str) -> str:
+    """Read a required environment variable, raising ValueError if unset."""
+    value = os.environ.get(name)
+    if not value:
+        raise ValueError(f"Missing required environment variable: {name}")
+    return value
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean environment variable ('true', '1', 'yes', 'on')."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('true', '1', 'yes', 'on')
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
+    """Application settings, read once from the environment at import."""
+
     # Gradient AI Configuration
-    gradient_access_token: str = Field(..., env="GRADIENT_ACCESS_TOKEN")
-    gradient_workspace_id: str = Field(..., env="GRADIENT_WORKSPACE_ID")
-    
+    gradient_access_token: str
+    gradient_workspace_id: str
+
     # Database Configuration
-    database_url: Optional[str] = Field(None, env="DATABASE_URL")
-    
+    database_url: Optional[str] = None
+
     # Safety Configuration
-    allow_production_connections: bool = Field(False, env="ALLOW_PRODUCTION_CONNECTIONS")
-    max_generated_records: int = Field(1000, env="MAX_GENERATED_RECORDS")
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    allow_production_connections: bool = False
+    max_generated_records: int = 1000
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from os.environ, after loading any .env file."""
+        load_dotenv()
+        return cls(
+            gradient_access_token=_require_env("GRADIENT_ACCESS_TOKEN"),
+            gradient_workspace_id=_require_env("GRADIENT_WORKSPACE_ID"),
+            database_url=os.environ.get("DATABASE_URL") or None,
+            allow_production_connections=_env_bool("ALLOW_PRODUCTION_CONNECTIONS"),
+            max_generated_records=int(os.environ.get("MAX_GENERATED_RECORDS", "1000")),
+        )
 
 
 # Global settings instance
-settings = Settings()
+settings = Settings.from_env()
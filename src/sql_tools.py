@@ -1,12 +1,56 @@
 """SQL tools for the agent."""
 
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from config import settings
 from synthetic_data_generator import SyntheticDataGenerator
 
+try:
+    # google-re2 matches in linear time, which keeps very long pasted
+    # queries cheap to scan; fall back to the stdlib engine otherwise
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# Plain substrings that make a query unsafe, checked with a cheap `in` test
+# before any regex runs (matched against lowercased text)
+_DANGEROUS_LITERALS = (
+    '--',  # SQL comments
+    'information_schema',
+    'sys.',
+)
+# Patterns that make a query unsafe to execute (matched against lowercased text)
+_DANGEROUS_PATTERNS = (
+    r'\b(?:drop|delete|truncate|alter|create|insert|update)\b',
+    r'\b(?:exec|execute|sp_|xp_)\b',
+    r'/\*.*?\*/',  # Block comments
+    r'union\s+select',  # SQL injection patterns
+)
+# All patterns fused into one alternation so a query is scanned once; the
+# matching group name (p0, p1, ...) identifies the pattern that hit. The
+# DOTALL flag is inline so the pattern compiles under either engine.
+_DANGEROUS_RE = _regex_engine.compile(
+    '(?s)' + '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(_DANGEROUS_PATTERNS))
+)
+
+# Names that suggest a query targets a production environment, as whole
+# identifier parts (so 'prod_db' matches but 'products' and 'domain' don't)
+_PRODUCTION_RE = re.compile(r'(?<![a-z0-9])(?:production|prod|live|main)(?![a-z0-9])')
+
+# Leading keywords of statements that return rows
+_ROW_RETURNING_VERBS = ('select', 'show', 'describe', 'explain', 'with')
+
+# Connection pool sizing for non-SQLite databases
+_POOL_SIZE = 8
+_MAX_OVERFLOW = 8
+
+# Maximum rows fetched by execute_safe_query; use execute_safe_query_iter to
+# stream larger results
+_MAX_RESULT_ROWS = 1000
+
 
 class SQLTools:
     """Tools for SQL operations and safety checks."""
@@ -15,13 +59,21 @@ class SQLTools:
         """Initialize SQL tools."""
         self.generator = SyntheticDataGenerator()
         self.engine = None
+        # Reflected schemas and table names, kept until invalidate_schema_cache()
+        self._schema_cache: Dict[str, Dict[str, Any]] = {}
+        self._tables_cache: Optional[List[str]] = None
         self._initialize_engine()
     
     def _initialize_engine(self):
         """Initialize database engine if database URL is provided."""
         if settings.database_url:
             try:
-                self.engine = create_engine(settings.database_url)
+                # Keep a pool of live connections so repeated queries and schema
+                # lookups don't pay connection setup each time
+                engine_kwargs = {'pool_pre_ping': True}
+                if make_url(settings.database_url).get_backend_name() != 'sqlite':
+                    engine_kwargs.update(pool_size=_POOL_SIZE, max_overflow=_MAX_OVERFLOW)
+                self.engine = create_engine(settings.database_url, **engine_kwargs)
                 # Test connection
                 with self.engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
@@ -38,32 +90,23 @@ class SQLTools:
         Returns:
             Tuple of (is_safe, reason)
         """
-        query_lower = query.lower().strip()
-        
-        # Check for dangerous operations
-        dangerous_patterns = [
-            r'\b(drop|delete|truncate|alter|create|insert|update)\b',
-            r'\b(exec|execute|sp_|xp_)\b',
-            r'--',  # SQL comments
-            r'/\*.*?\*/',  # Block comments
-            r'union\s+select',  # SQL injection patterns
-            r'information_schema',
-            r'sys\.',
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
-                return False, f"Query contains potentially dangerous pattern: {pattern}"
+        query_lower = query.strip().lower()
         
-        # Check for production database indicators
-        production_indicators = [
-            'prod', 'production', 'live', 'main'
-        ]
+        # Check for dangerous literals, then the remaining patterns in one scan
+        for literal in _DANGEROUS_LITERALS:
+            if literal in query_lower:
+                return False, f"Query contains potentially dangerous pattern: {literal}"
         
-        for indicator in production_indicators:
-            if indicator in query_lower:
-                if not settings.allow_production_connections:
-                    return False, f"Query references production environment: {indicator}"
+        match = _DANGEROUS_RE.search(query_lower)
+        if match:
+            pattern = _DANGEROUS_PATTERNS[int(match.lastgroup[1:])]
+            return False, f"Query contains potentially dangerous pattern: {pattern}"
+        
+        # Check for production database indicators
+        if not settings.allow_production_connections:
+            match = _PRODUCTION_RE.search(query_lower)
+            if match:
+                return False, f"Query references production environment: {match.group()}"
         
         return True, "Query appears safe"
     
@@ -83,13 +126,28 @@ class SQLTools:
         users = self.generator.generate_users(count)
         
         if format_type.lower() == 'sql':
-            inserts = self.generator.to_sql_inserts(users, 'users')
-            return '\n'.join(inserts)
+            return self.generator.to_sql_string(users, 'users')
         elif format_type.lower() == 'csv':
             return self.generator.to_csv(users)
         else:
             return str(users)
     
+    def generate_mock_users_iter(self, count: int) -> Iterator[str]:
+        """Generate mock users as a stream of SQL INSERT statements.
+        
+        Args:
+            count: Number of users to generate
+            
+        Returns:
+            Iterator of SQL INSERT statements, one per user, or of a single
+            error message if count exceeds the configured record limit
+        """
+        if count > settings.max_generated_records:
+            return iter([f"Error: Cannot generate more than {settings.max_generated_records} records"])
+        
+        users = self.generator.generate_users(count)
+        return self.generator.iter_sql_inserts(users, 'users')
+    
     def generate_mock_orders(self, count: int, amount_range: Tuple[float, float] = (10, 500),
                            year: Optional[int] = None, format_type: str = 'sql') -> str:
         """Generate mock orders in specified format.
@@ -109,8 +167,7 @@ class SQLTools:
         orders = self.generator.generate_orders(count, amount_range=amount_range, year=year)
         
         if format_type.lower() == 'sql':
-            inserts = self.generator.to_sql_inserts(orders, 'orders')
-            return '\n'.join(inserts)
+            return self.generator.to_sql_string(orders, 'orders')
         elif format_type.lower() == 'csv':
             return self.generator.to_csv(orders)
         else:
@@ -129,13 +186,10 @@ class SQLTools:
         if count > settings.max_generated_records:
             return f"Error: Cannot generate more than {settings.max_generated_records} records"
         
-        # Generate more transactions to ensure we get enough failed ones
-        all_transactions = self.generator.generate_payment_transactions(count * 2, include_failed=True)
-        failed_transactions = [t for t in all_transactions if t['status'] == 'failed'][:count]
+        failed_transactions = self.generator.generate_payment_transactions(count, status='failed')
         
         if format_type.lower() == 'sql':
-            inserts = self.generator.to_sql_inserts(failed_transactions, 'payment_transactions')
-            return '\n'.join(inserts)
+            return self.generator.to_sql_string(failed_transactions, 'payment_transactions')
         elif format_type.lower() == 'csv':
             return self.generator.to_csv(failed_transactions)
         else:
@@ -160,16 +214,18 @@ class SQLTools:
         data = self.generator.generate_custom_data(schema, count)
         
         if format_type.lower() == 'sql':
-            inserts = self.generator.to_sql_inserts(data, table_name)
-            return '\n'.join(inserts)
+            return self.generator.to_sql_string(data, table_name)
         elif format_type.lower() == 'csv':
             return self.generator.to_csv(data)
         else:
             return str(data)
     
-    def execute_safe_query(self, query: str) -> Tuple[bool, str, Optional[List[Dict]]]:
+    def execute_safe_query(self, query: str) -> Tuple[bool, str, Optional[List[Mapping[str, Any]]]]:
         """Execute a query if it's deemed safe.
         
+        At most ``_MAX_RESULT_ROWS`` rows are fetched; the message says so
+        when the query matched more.
+        
         Args:
             query: SQL query to execute
             
@@ -188,11 +244,16 @@ class SQLTools:
                 result = conn.execute(text(query))
                 
                 # Handle different types of queries
-                if query.strip().lower().startswith('select'):
-                    rows = result.fetchall()
-                    columns = result.keys()
-                    results = [dict(zip(columns, row)) for row in rows]
-                    return True, f"Query executed successfully. {len(results)} rows returned.", results
+                if query.lstrip().lower().startswith(_ROW_RETURNING_VERBS):
+                    # Fetch one row past the cap to tell whether any were left out
+                    results = result.mappings().fetchmany(_MAX_RESULT_ROWS + 1)
+                    if len(results) > _MAX_RESULT_ROWS:
+                        del results[_MAX_RESULT_ROWS:]
+                        message = (f"Query executed successfully. First {_MAX_RESULT_ROWS} "
+                                   "rows shown (more rows matched).")
+                    else:
+                        message = f"Query executed successfully. {len(results)} rows returned."
+                    return True, message, results
                 else:
                     conn.commit()
                     return True, "Query executed successfully.", None
@@ -200,6 +261,38 @@ class SQLTools:
         except SQLAlchemyError as e:
             return False, f"Database error: {str(e)}", None
     
+    def execute_safe_query_iter(self, query: str) -> Iterator[Mapping[str, Any]]:
+        """Execute a SELECT query if it's deemed safe, streaming its rows.
+        
+        Rows are fetched from the driver in batches as the iterator is
+        consumed, so large results are never held in memory at once.
+        The connection and safety checks run when this is called, not when
+        the first row is requested.
+        
+        Args:
+            query: SQL query to execute
+            
+        Returns:
+            Iterator of mappings of column name to value, one per row
+            
+        Raises:
+            ValueError: If there is no database connection or the query is unsafe
+        """
+        if not self.engine:
+            raise ValueError("No database connection available")
+        
+        is_safe, reason = self.is_safe_query(query)
+        if not is_safe:
+            raise ValueError(f"Query rejected: {reason}")
+        
+        return self._iter_query_rows(query)
+    
+    def _iter_query_rows(self, query: str) -> Iterator[Mapping[str, Any]]:
+        """Yield the rows of an already validated query, fetched in batches."""
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=_MAX_RESULT_ROWS).execute(text(query))
+            yield from result.mappings()
+    
     def get_table_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
         """Get schema information for a table.
         
@@ -212,28 +305,63 @@ class SQLTools:
         if not self.engine:
             return None
         
+        if table_name in self._schema_cache:
+            return self._schema_cache[table_name]
+        
         try:
             inspector = inspect(self.engine)
-            columns = inspector.get_columns(table_name)
-            
-            schema = {
-                'table_name': table_name,
-                'columns': []
-            }
-            
-            for col in columns:
-                schema['columns'].append({
-                    'name': col['name'],
-                    'type': str(col['type']),
-                    'nullable': col['nullable'],
-                    'default': col.get('default')
-                })
-            
+            schema = self._build_schema(table_name, inspector.get_columns(table_name))
+            self._schema_cache[table_name] = schema
             return schema
             
         except SQLAlchemyError:
             return None
     
+    def get_all_schemas(self) -> Dict[str, Dict[str, Any]]:
+        """Get schema information for every table in the database.
+        
+        Uses a single inspector over one connection for all tables, so
+        reflection results and the connection are shared across tables.
+        Tables already reflected are served from the schema cache.
+        
+        Returns:
+            Dictionary mapping table names to schema information
+        """
+        if not self.engine:
+            return {}
+        
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(conn)
+                if self._tables_cache is None:
+                    self._tables_cache = inspector.get_table_names()
+                for table_name in self._tables_cache:
+                    if table_name not in self._schema_cache:
+                        self._schema_cache[table_name] = self._build_schema(
+                            table_name, inspector.get_columns(table_name)
+                        )
+        except SQLAlchemyError:
+            return {}
+        
+        return {table_name: self._schema_cache[table_name] for table_name in self._tables_cache}
+    
+    def _build_schema(self, table_name: str, columns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build schema information from reflected column definitions."""
+        schema = {
+            'table_name': table_name,
+            'columns': []
+        }
+        
+        for col in columns:
+            schema['columns'].append({
+                'name': col['name'],
+                'type': str(col['type']),
+                'nullable': col['nullable'],
+                'default': col.get('default')
+            })
+        
+        return schema
+    
     def list_tables(self) -> List[str]:
         """List all tables in the database.
         
@@ -243,8 +371,17 @@ class SQLTools:
         if not self.engine:
             return []
         
+        if self._tables_cache is not None:
+            return self._tables_cache
+        
         try:
             inspector = inspect(self.engine)
-            return inspector.get_table_names()
+            self._tables_cache = inspector.get_table_names()
+            return self._tables_cache
         except SQLAlchemyError:
             return []
+    
+    def invalidate_schema_cache(self):
+        """Forget cached schemas and table names, e.g. after the schema changes."""
+        self._schema_cache.clear()
+        self._tables_cache = None